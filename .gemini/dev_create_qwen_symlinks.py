@@ -1,7 +1,11 @@
 import os
+import re
 import sys
 import argparse
 
+# Command names within an argument, separated by commas and/or whitespace
+_TOKEN = re.compile(r'[^,\s]+')
+
 def create_symlinks(filenames):
     # Get the project root dynamically
     # Assuming the script is in the project root
@@ -11,42 +15,60 @@ def create_symlinks(filenames):
 
     os.makedirs(qwen_commands_dir, exist_ok=True)
 
-    for filename_arg in filenames:
-        # Handle comma-separated filenames
-        for single_filename in filename_arg.split(','):
-            single_filename = single_filename.strip()
-            if not single_filename:
-                continue
+    # Snapshot the destination directory once; DirEntry caches the file type,
+    # so no extra stat calls are needed to inspect existing entries.
+    with os.scandir(qwen_commands_dir) as it:
+        existing = {entry.name: entry for entry in it}
 
-            # Ensure .toml extension
-            if not single_filename.endswith('.toml'):
-                single_filename += '.toml'
+    # Output is collected and written in a single call at the end
+    lines = []
+    processed = set()
 
-            source_path = os.path.join(gemini_commands_dir, single_filename)
-            destination_path = os.path.join(qwen_commands_dir, single_filename)
+    # Handle comma-separated filenames and ensure the .toml extension
+    names = [
+        token if token.endswith('.toml') else token + '.toml'
+        for filename_arg in filenames
+        for token in _TOKEN.findall(filename_arg)
+    ]
 
-            print(f"Processing: {single_filename}")
-            print(f"  Source: {source_path}")
-            print(f"  Destination: {destination_path}")
+    for single_filename in names:
+        if single_filename in processed:
+            continue
+        processed.add(single_filename)
 
-            if not os.path.exists(source_path):
-                print(f"Error: Source file not found: {source_path}")
-                continue
+        source_path = os.path.join(gemini_commands_dir, single_filename)
+        destination_path = os.path.join(qwen_commands_dir, single_filename)
+
+        lines.append(f"Processing: {single_filename}")
+        lines.append(f"  Source: {source_path}")
+        lines.append(f"  Destination: {destination_path}")
 
-            if os.path.exists(destination_path):
-                if os.path.islink(destination_path):
-                    print(f"  Existing symlink found, removing: {destination_path}")
-                    os.remove(destination_path)
-                else:
-                    print(f"  Warning: A file/directory already exists at destination (not a symlink). Skipping to avoid data loss: {destination_path}")
+        if not os.path.exists(source_path):
+            lines.append(f"Error: Source file not found: {source_path}")
+            continue
+
+        entry = existing.get(single_filename)
+        if entry is not None:
+            if entry.is_symlink():
+                # Only rewrite symlinks that point somewhere else
+                if os.readlink(entry.path) == source_path:
+                    lines.append(f"  Symlink is already up to date, skipping: {destination_path}")
                     continue
+                lines.append(f"  Existing symlink found, removing: {destination_path}")
+                os.remove(destination_path)
+            else:
+                lines.append(f"  Warning: A file/directory already exists at destination (not a symlink). Skipping to avoid data loss: {destination_path}")
+                continue
+
+        try:
+            os.symlink(source_path, destination_path)
+            lines.append(f"  Successfully created symlink: {destination_path} -> {source_path}")
+        except OSError as e:
+            lines.append(f"  Error creating symlink for {single_filename}: {e}")
+            lines.append("  On Windows, creating symlinks often requires Administrator privileges or Developer Mode enabled.")
 
-            try:
-                os.symlink(source_path, destination_path)
-                print(f"  Successfully created symlink: {destination_path} -> {source_path}")
-            except OSError as e:
-                print(f"  Error creating symlink for {single_filename}: {e}")
-                print("  On Windows, creating symlinks often requires Administrator privileges or Developer Mode enabled.")
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     parser = argparse.ArgumentParser(description="Create symlinks for .gemini commands in .qwen commands directory.")
@@ -8,23 +8,42 @@ composing prompts, and watching for file changes.
 
 @copyright: (c) 2025 by The Scribe Works.
 """
+from __future__ import annotations
+
+import functools
 import os
-import sys
+import threading
 import queue
-import time
+import shutil
 from importlib import resources
+from importlib.resources.abc import Traversable
 from pathlib import Path
-from typing import List
-from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
 import typer
 from typing_extensions import Annotated
-from watchdog.events import FileSystemEventHandler
-from watchdog.observers import Observer
 
-from .composer import PromptComposer, PromptScribeError
 from .ui import ui
 
+# The composer (Jinja2, YAML, Markdown) and watchdog are comparatively expensive
+# to import, so they are imported lazily by the code paths that need them.
+# This keeps '--help' and 'init' fast.
+if TYPE_CHECKING:
+    from .composer import PromptComposer
+
+# File system types on which native change notifications are unreliable
+NETWORK_FILESYSTEM_TYPES = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "sshfs", "9p", "afs", "ceph", "glusterfs"}
+
+# Default polling interval (in seconds) for network file systems
+DEFAULT_POLLING_INTERVAL = 30.0
+
+# Maximum number of threads used to copy scaffold files
+MAX_COPY_WORKERS = 8
+
+# Maximum number of threads used to compose agents
+MAX_COMPOSE_WORKERS = 8
+
 app = typer.Typer(
     name="prompt-scribe",
     help="A powerful, template-based prompt composer for crafting and managing complex instructions for LLMs.",
@@ -32,6 +51,48 @@ app = typer.Typer(
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _scaffolds_root() -> Traversable:
+    """Returns the package resource handle of the bundled scaffolds directory."""
+    return resources.files("promptscribe") / "scaffolds"
+
+
+@functools.lru_cache(maxsize=1)
+def _available_scaffolds() -> frozenset[str]:
+    """Returns the names of all bundled scaffolds. The result is cached per process."""
+    # 'os.scandir' reports the entry types from the directory listing itself,
+    # unlike 'iterdir()' followed by an 'is_dir()' stat per entry.
+    with resources.as_file(_scaffolds_root()) as scaffolds_path:
+        try:
+            with os.scandir(scaffolds_path) as it:
+                return frozenset(entry.name for entry in it if entry.is_dir())
+        except (FileNotFoundError, NotADirectoryError):
+            return frozenset()
+
+
+def _scandir_recursive(root: str, prefix: str = "") -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Recursively yields all files below a directory.
+
+    Uses 'os.scandir' so that the file type of each entry comes from the
+    directory listing itself instead of a separate 'stat' call.
+
+    Args:
+        root: The directory to traverse.
+        prefix: The relative path of 'root', prepended to the yielded paths.
+
+    Yields:
+        Tuples of (relative path, directory entry) for every regular file.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            rel_path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_recursive(entry.path, rel_path + os.sep)
+            elif entry.is_file(follow_symlinks=False):
+                yield rel_path, entry
+
+
 @app.command()
 def init(
     path: Annotated[Path, typer.Argument(
@@ -62,18 +123,13 @@ def init(
     Initializes a new Prompt Scribe project with a specified scaffold structure.
     """
     # Discover available scaffolds dynamically
-    scaffolds_path = resources.files("promptscribe") / "scaffolds"
-    available_scaffolds = []
-    if scaffolds_path.is_dir():
-        for item in scaffolds_path.iterdir():
-            if item.is_dir():
-                available_scaffolds.append(item.name)
+    available_scaffolds = _available_scaffolds()
     
     # If user wants to list scaffolds, show them and exit
     if list_scaffolds:
         if available_scaffolds:
             ui.title("Available scaffolds:")
-            for scaffold_name in available_scaffolds:
+            for scaffold_name in sorted(available_scaffolds):
                 print(f"  - {scaffold_name}")
         else:
             ui.info("No scaffolds found.")
@@ -81,7 +137,7 @@ def init(
 
     # Validate scaffold option
     if scaffold not in available_scaffolds:
-        ui.error(f"Unknown scaffold '{scaffold}'. Available scaffolds: {available_scaffolds}")
+        ui.error(f"Unknown scaffold '{scaffold}'. Available scaffolds: {sorted(available_scaffolds)}")
         raise typer.Exit(code=1)
     
     ui.title(f"Initializing Prompt Scribe project using '{scaffold}' scaffold...")
@@ -101,33 +157,41 @@ def init(
     
     # Create standard directories unconditionally for all scaffolds
     dirs = ["personas", "includes", "templates"]
+    created_dirs = {project_path}
     for d in dirs:
         (project_path / d).mkdir(exist_ok=True)
+        created_dirs.add(project_path / d)
     
     # Copy template files from the specified scaffold
-    scaffold_path = resources.files("promptscribe") / "scaffolds" / scaffold
+    scaffold_path = _scaffolds_root() / scaffold
     
     # If the scaffold directory exists, copy all its contents recursively
     if (scaffold_path).is_dir():
         # Copy all scaffold contents to the target project directory
-        scaffold_source = scaffold_path
-        for item in scaffold_source.rglob("*"):
-            if item.is_file():
-                # Calculate the relative path from the scaffold directory
-                rel_path = item.relative_to(scaffold_source)
+        with resources.as_file(scaffold_path) as scaffold_source:
+            # Collect the files to copy first, so that the copies can run concurrently
+            copy_tasks = []
+            cwd = Path.cwd()
+            for rel_path, entry in _scandir_recursive(str(scaffold_source)):
                 dest_path = project_path / rel_path
                 
                 # Check if destination file already exists
                 if dest_path.exists() and not force:
-                    ui.info(f"Skipping existing file: {dest_path.relative_to(Path.cwd())}")
+                    ui.info(f"Skipping existing file: {dest_path.relative_to(cwd)}")
                     continue
                 
-                # Ensure parent directory exists
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file content
-                source_content = item.read_text(encoding="utf-8")
-                dest_path.write_text(source_content, encoding="utf-8")
+                # Ensure parent directory exists, creating each directory only once
+                # (including the ones created above)
+                if dest_path.parent not in created_dirs:
+                    dest_path.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(dest_path.parent)
+                copy_tasks.append((entry.path, dest_path))
+
+            # Copy file content as-is; copyfile uses in-kernel copying where available.
+            # Copying many small files is latency-bound, so the copies are overlapped.
+            if copy_tasks:
+                with ThreadPoolExecutor(max_workers=min(MAX_COPY_WORKERS, len(copy_tasks))) as executor:
+                    list(executor.map(lambda task: shutil.copyfile(*task), copy_tasks))
     else:
         # Fallback to old behavior for backward compatibility if needed
         ui.error(f"Scaffold '{scaffold}' not found.")
@@ -137,130 +201,349 @@ def init(
     ui.info(f"Next steps: customize '{project_path / 'prompts.yml'}' and run 'prompt-scribe compose'")
 
 
-def _compose_agents(composer: PromptComposer, agent_names: List[str]):
-    """Helper function to compose a list of agents."""
+def _compose_agent_deferred(composer: PromptComposer, agent_name: str) -> Tuple[list, Exception | None]:
+    """
+    Composes a single agent while collecting its console output.
+
+    Returns:
+        The collected messages and the exception raised, if any.
+    """
+    with ui.deferred() as messages:
+        try:
+            composer.compose_agent(agent_name)
+        except Exception as e:
+            return messages, e
+    return messages, None
+
+
+def _compose_in_threads(composer: PromptComposer, agent_names: List[str]) -> Iterator[Tuple[str, list, Exception | None]]:
+    """
+    Composes agents concurrently in threads of this process.
+
+    Yields:
+        Tuples of (agent name, collected messages, exception raised or None),
+        in the order of 'agent_names'.
+    """
+    with ThreadPoolExecutor(max_workers=min(MAX_COMPOSE_WORKERS, len(agent_names))) as executor:
+        futures = [
+            executor.submit(_compose_agent_deferred, composer, agent_name)
+            for agent_name in agent_names
+        ]
+        for agent_name, future in zip(agent_names, futures):
+            messages, error = future.result()
+            yield agent_name, messages, error
+
+
+def _compose_agents(
+    composer: PromptComposer,
+    agent_names: List[str],
+    processes: bool = False,
+    failed_agents: set[str] | None = None,
+):
+    """
+    Helper function to compose a list of agents.
+
+    Agents are independent of each other, so several agents are composed
+    concurrently: in threads by default, or in worker processes if
+    'processes' is set. The output of each agent is printed as one block,
+    in the order the agents were requested.
+
+    The names of agents that could not be composed are added to
+    'failed_agents', if given, before 'typer.Exit' is raised.
+    """
+    from .composer import PromptScribeError
+
     target_agents = agent_names or composer.get_all_agent_names()
     if not target_agents:
         ui.warning("No agents found in configuration. Nothing to compose.")
         return
 
-    for agent_name in target_agents:
+    if len(target_agents) == 1:
         try:
-            composer.compose_agent(agent_name)
+            composer.compose_agent(target_agents[0])
         except PromptScribeError as e:
-            ui.error(f"Error composing agent '{agent_name}': {e}")
+            ui.error(f"Error composing agent '{target_agents[0]}': {e}")
+            if failed_agents is not None:
+                failed_agents.add(target_agents[0])
             raise typer.Exit(1)
+        return
 
+    if processes:
+        results = composer.compose_all(target_agents)
+    else:
+        results = _compose_in_threads(composer, target_agents)
 
-class ChangeHandler(FileSystemEventHandler):
-    """Handles file system events and triggers recomposition."""
+    failed = False
+    for agent_name, messages, error in results:
+        ui.flush(messages)
+        if isinstance(error, PromptScribeError):
+            ui.error(f"Error composing agent '{agent_name}': {error}")
+            failed = True
+            if failed_agents is not None:
+                failed_agents.add(agent_name)
+        elif error is not None:
+            raise error
 
-    def __init__(self, composer: PromptComposer, agent_names: List[str], restart_queue: queue.Queue):
-        self.composer = composer
+    if failed:
+        raise typer.Exit(1)
+
+
+class ChangeHandler:
+    """
+    Handles file system events and triggers recomposition.
+
+    Implements the watchdog event handler interface ('dispatch') without
+    inheriting from 'FileSystemEventHandler', so that watchdog is only
+    imported once watching actually starts.
+    """
+
+    def __init__(
+        self,
+        composer: PromptComposer,
+        agent_names: List[str],
+        restart_queue: queue.Queue,
+        retry_agents: Iterable[str] = (),
+    ):
         self.agent_names = agent_names
-        self.reverse_dependencies = composer.get_reverse_dependencies()
         self.restart_queue = restart_queue
+        # Agents that failed to recompose after the last config change. Their
+        # changes are already part of the reloaded configuration, so they are
+        # retried with the next config change rather than compared again.
+        self.retry_agents = set(retry_agents)
+        self._set_composer(composer)
+
+        # Used for log messages only; the working directory does not change
+        # during a watch session.
+        self._cwd = Path.cwd()
         
-        # Debouncing mechanism
-        self.last_event_time = 0
-        self.debounce_interval = 0.5  # seconds
+        # Debouncing mechanism: events are collected and handled in one batch
+        # once the file system has been quiet for 'debounce_interval' seconds.
+        # This coalesces editor save bursts (write, rename, chmod) into one recomposition.
+        self.debounce_interval = 0.2  # seconds
+        self._pending_events: set[str] = set()
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        # Serializes batches, as a slow recomposition may outlast the next quiet period
+        self._flush_lock = threading.Lock()
+
+    def _set_composer(self, composer: PromptComposer):
+        """
+        Switches the handler to a (new) composer and precomputes the lookup data
+        used for every event.
+
+        Watched directories come from already resolved dependency paths, so
+        event paths are absolute and can be matched as plain strings without
+        resolving them again.
+        """
+        self.composer = composer
+        self._config_path_str = str(composer.config_path)
+        self._agent_dependencies: dict[str, frozenset[str]] = {
+            agent_name: frozenset(map(str, paths)) for agent_name, paths in composer.dependencies.items()
+        }
+        self.reverse_dependencies: dict[str, frozenset[str]] = {
+            str(path): frozenset(agents) for path, agents in composer.get_reverse_dependencies().items()
+        }
+        self._update_relevant_suffixes()
+
+        settings = composer.config.get("settings", {})
+        output_dir_str = settings.get("output_dir", "composed_prompts")
+        self._output_prefix = os.path.join(str(composer._resolve_path(output_dir_str)), "")
     
-    def on_any_event(self, event):
-        current_time = time.time()
-        if (current_time - self.last_event_time) < self.debounce_interval:
-            return
-        self.last_event_time = current_time
+    def _update_relevant_suffixes(self):
+        """
+        Only files with the extension of a known dependency can affect an agent,
+        which filters out editor swap and backup files before they are queued.
+        """
+        self._relevant_suffixes = frozenset(
+            os.path.splitext(path)[1] for path in (*self.reverse_dependencies, self._config_path_str)
+        )
+
+    def _refresh_dependencies(self, agent_names: Iterable[str]):
+        """
+        Updates the lookup data after agents were recomposed, since an edited file
+        may have started or stopped including other files. Only the entries of
+        the given agents are touched.
+        """
+        changed = False
+        for agent_name in agent_names:
+            old_paths = self._agent_dependencies.get(agent_name, frozenset())
+            new_paths = frozenset(map(str, self.composer.dependencies.get(agent_name, ())))
+            if new_paths == old_paths:
+                continue
+
+            for path in old_paths - new_paths:
+                remaining = self.reverse_dependencies.get(path, frozenset()) - {agent_name}
+                if remaining:
+                    self.reverse_dependencies[path] = remaining
+                else:
+                    self.reverse_dependencies.pop(path, None)
+            for path in new_paths - old_paths:
+                self.reverse_dependencies[path] = self.reverse_dependencies.get(path, frozenset()) | {agent_name}
+            self._agent_dependencies[agent_name] = new_paths
+            changed = True
+
+        if changed:
+            self._update_relevant_suffixes()
+
+    def _display_path(self, path: str) -> str:
+        """Formats a path relative to the working directory for log messages."""
+        try:
+            return str(Path(path).relative_to(self._cwd))
+        except ValueError:
+            return path
+
+    def dispatch(self, event):
+        """Entry point called by the watchdog observer for every event."""
+        self.on_any_event(event)
 
-        if event.is_directory or event.event_type not in ['modified', 'created', 'deleted']:
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ['modified', 'created', 'deleted', 'moved']:
             return
         
-        src_path = Path(event.src_path).resolve()
+        # Editors often save by writing a temporary file and renaming it over
+        # the original, so for moves the destination is the changed file.
+        changed_path = event.dest_path if event.event_type == 'moved' else event.src_path
+        src_path = os.path.normpath(changed_path)
         
-        # Ignore events in the output directory
-        settings = self.composer.config.get("settings", {})
-        output_dir_str = settings.get("output_dir", "composed_prompts")
-        output_path = self.composer._resolve_path(output_dir_str)
-        if src_path.is_relative_to(output_path):
+        # Ignore events in the output directory and for unrelated file types
+        if src_path.startswith(self._output_prefix) or os.path.splitext(src_path)[1] not in self._relevant_suffixes:
             return
 
-        ui.info(f"Change detected in '{src_path.relative_to(Path.cwd())}'.")
-
-        try:
-            if src_path == self.composer.config_path:
-                self.handle_config_change()
+        # Restart the quiet period on every relevant event
+        with self._lock:
+            self._pending_events.add(src_path)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_interval, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self):
+        """Handles all changes collected during the last debounce interval."""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending_events
+                self._pending_events = set()
+                self._timer = None
+
+            for src_path in sorted(pending):
+                ui.info(f"Change detected in '{self._display_path(src_path)}'.")
+
+            try:
+                composed_agents = set()
+                if self._config_path_str in pending:
+                    pending.discard(self._config_path_str)
+                    composed_agents = self.handle_config_change()
+                if pending:
+                    self.handle_dependency_change(pending, composed_agents)
+            except Exception as e:
+                ui.error(f"An error occurred during recomposition: {e}")
+
+    def handle_dependency_change(self, src_paths: set[str], already_composed: set[str] = frozenset()):
+        """
+        Handle changes in included files, templates, etc.
+
+        Args:
+            src_paths: The changed files.
+            already_composed: Agents that were already recomposed in the current batch.
+        """
+        affected_agents = set()
+        for src_path in src_paths:
+            agents = self.reverse_dependencies.get(src_path)
+            if agents:
+                affected_agents.update(agents)
             else:
-                self.handle_dependency_change(src_path)
-        except Exception as e:
-            ui.error(f"An error occurred during recomposition: {e}")
-
-    def handle_dependency_change(self, src_path: Path):
-        """Handle changes in included files, templates, etc."""
-        affected_agents = self.reverse_dependencies.get(src_path)
-        if affected_agents:
-            ui.info(f"Recomposing affected agents: {', '.join(affected_agents)}")
-            # Reload config to catch potential variable changes that affect includes
-            fresh_composer = PromptComposer(str(self.composer.config_path))
-            _compose_agents(fresh_composer, affected_agents)
-        else:
-            # If the file is not a direct dependency, just ignore it.
-            # This prevents unnecessary recomposition.
-            ui.info(f"Change in '{src_path.relative_to(Path.cwd())}' does not affect any known agents. Skipping.")
+                # If the file is not a direct dependency, just ignore it.
+                # This prevents unnecessary recomposition.
+                ui.info(f"Change in '{self._display_path(src_path)}' does not affect any known agents. Skipping.")
 
+        # The configuration itself is unchanged, so the current composer is reused;
+        # only the changed files have to be read again.
+        self.composer.invalidate(Path(src_path) for src_path in src_paths)
 
-    def handle_config_change(self):
-        """Handle changes in the main prompts.yml file."""
+        affected_agents -= already_composed
+        if affected_agents:
+            ui.info(f"Recomposing affected agents: {', '.join(sorted(affected_agents))}")
+            try:
+                _compose_agents(self.composer, sorted(affected_agents))
+            finally:
+                self._refresh_dependencies(affected_agents)
+
+    def handle_config_change(self) -> set:
+        """
+        Handle changes in the main prompts.yml file.
+
+        Returns:
+            The set of agents that were recomposed.
+        """
         ui.info("Configuration file changed. Analyzing changes...")
+        composer = self.composer
 
-        # 1. Get current watch paths
-        old_deps = self.composer.get_all_dependencies()
+        # 1. Remember the current state for comparison
+        old_fingerprints = composer.config_fingerprints
+        old_deps = composer.get_all_dependencies()
         old_watch_dirs = {p.parent for p in old_deps}
 
-        # 2. Create a new composer and analyze new dependencies
-        fresh_composer = PromptComposer(str(self.composer.config_path))
+        # 2. Reload the configuration in place and analyze new dependencies.
+        # Events that leave the file untouched (same mtime and size) are ignored.
+        if not composer.reload_if_changed():
+            ui.info("No effective changes detected in agent configurations.")
+            return set()
 
-        with suppress_stdout():
-            fresh_composer.analyze_dependencies()
+        with ui.muted():
+            composer.analyze_dependencies()
         
-        new_deps = fresh_composer.get_all_dependencies()
+        new_deps = composer.get_all_dependencies()
         new_watch_dirs = {p.parent for p in new_deps}
 
         # First, determine what needs to be rebuilt, regardless of whether paths change
-        agents_to_rebuild = self.find_changed_agents(self.composer.config, fresh_composer.config)
+        agents_to_rebuild = self.find_changed_agents(old_fingerprints, composer.config_fingerprints)
+        agents_to_rebuild |= self.retry_agents
         
         # Filter out agents that no longer exist in the new configuration.
-        existing_agents_in_new_config = set(fresh_composer.get_all_agent_names())
+        existing_agents_in_new_config = set(composer.get_all_agent_names())
         valid_agents_to_rebuild = agents_to_rebuild & existing_agents_in_new_config
 
-        # Use the filtered list to recompose only valid, existing agents.
-        if valid_agents_to_rebuild:
-            ui.info(f"Recomposing agents affected by config change: {', '.join(valid_agents_to_rebuild)}")
-            _compose_agents(fresh_composer, list(valid_agents_to_rebuild))
-        else:
-            ui.info("No effective changes detected in agent configurations.")
+        # The composer already holds the new configuration, so the handler's
+        # lookup data has to follow it even if some agents fail to compose.
+        failed_agents: set[str] = set()
+        try:
+            # Use the filtered list to recompose only valid, existing agents.
+            if valid_agents_to_rebuild:
+                ui.info(f"Recomposing agents affected by config change: {', '.join(sorted(valid_agents_to_rebuild))}")
+                _compose_agents(composer, sorted(valid_agents_to_rebuild), failed_agents=failed_agents)
+            else:
+                ui.info("No effective changes detected in agent configurations.")
+        finally:
+            self.retry_agents = failed_agents
 
-        # 3. Compare watch paths AND ONLY THEN decide if the watcher needs to be restarted
-        if old_watch_dirs != new_watch_dirs:
-            ui.info("Watch paths have changed. Signaling for watcher restart.")
-            self.restart_queue.put(fresh_composer)
-        else:
-            # If paths haven't changed, just update the handler's state
-            ui.info("Watch paths remain the same.")
-            self.composer = fresh_composer
-            self.reverse_dependencies = fresh_composer.get_reverse_dependencies()
+            # 3. Compare watch paths AND ONLY THEN decide if the watcher needs to be restarted
+            if old_watch_dirs != new_watch_dirs:
+                ui.info("Watch paths have changed. Signaling for watcher restart.")
+                self.restart_queue.put((composer, frozenset(failed_agents)))
+            else:
+                # If paths haven't changed, just refresh the handler's lookup data
+                ui.info("Watch paths remain the same.")
+                self._set_composer(composer)
+
+        return valid_agents_to_rebuild
 
-    def find_changed_agents(self, old_config: dict, new_config: dict) -> set:
-        """Compares two config dictionaries to find which agents need rebuilding."""
+    def find_changed_agents(self, old_fingerprints: dict, new_fingerprints: dict) -> set:
+        """
+        Compares two sets of config fingerprints (see 'PromptComposer.config_fingerprints')
+        to find which agents need rebuilding.
+        """
         agents_to_rebuild = set()
         
         # Global changes trigger a full rebuild of all relevant agents
-        if old_config.get('settings') != new_config.get('settings') or \
-           old_config.get('variables') != new_config.get('variables'):
+        if old_fingerprints['settings'] != new_fingerprints['settings'] or \
+           old_fingerprints['variables'] != new_fingerprints['variables']:
             ui.info("Global settings or variables changed. Rebuilding all specified agents.")
-            return set(self.agent_names or new_config.get("agents", {}).keys())
+            return set(self.agent_names or new_fingerprints['agents'].keys())
 
         # Agent-specific changes
-        old_agents = old_config.get('agents', {})
-        new_agents = new_config.get('agents', {})
+        old_agents = old_fingerprints['agents']
+        new_agents = new_fingerprints['agents']
         all_agent_keys = set(old_agents.keys()) | set(new_agents.keys())
         
         for name in all_agent_keys:
@@ -273,32 +556,103 @@ class ChangeHandler(FileSystemEventHandler):
         return agents_to_rebuild
 
 
-def _run_watcher(composer: PromptComposer, agent_names: List[str]):
+def _is_network_filesystem(path: Path) -> bool:
+    """
+    Checks whether a path lives on a network file system (NFS, CIFS, SSHFS, ...).
+
+    Native change notifications are not delivered for remote modifications on
+    such file systems. Detection relies on '/proc/mounts' and therefore only
+    works on Linux; on other platforms the path is assumed to be local.
+    """
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return False
+
+    path_str = str(path)
+    best_match, best_fs_type = "", ""
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        # Spaces and other special characters are octal-escaped in '/proc/mounts'
+        mount_point = fields[1].replace("\\040", " ")
+        is_prefix = path_str == mount_point or path_str.startswith(mount_point.rstrip("/") + "/")
+        if is_prefix and len(mount_point) >= len(best_match):
+            best_match, best_fs_type = mount_point, fields[2]
+
+    return best_fs_type.split(".")[-1] in NETWORK_FILESYSTEM_TYPES
+
+
+def _create_observer(watch_paths: set[Path], watch_interval: float | None):
+    """
+    Selects the file system observer for the given watch paths.
+
+    Native notifications (e.g. inotify) are used for local file systems. Polling
+    is used for network file systems or when an explicit interval is requested.
+    """
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+
+    if watch_interval is None:
+        if not any(_is_network_filesystem(p) for p in watch_paths):
+            return Observer()
+        watch_interval = DEFAULT_POLLING_INTERVAL
+        ui.info("Network file system detected, native change notifications are unavailable.")
+
+    ui.info(f"Polling for changes every {watch_interval:g} seconds.")
+    return PollingObserver(timeout=watch_interval)
+
+
+def _run_watcher(
+    composer: PromptComposer,
+    agent_names: List[str],
+    watch_interval: float | None = None,
+    retry_agents: Iterable[str] = (),
+):
     """Sets up and runs a SINGLE watcher instance.
-    Returns a new composer instance if a restart is needed, otherwise None.
+    Returns the composer and the agents to retry (see 'ChangeHandler.retry_agents')
+    as a tuple if a restart is needed, otherwise None.
     """
+    from watchdog.events import FileCreatedEvent, FileDeletedEvent, FileModifiedEvent, FileMovedEvent
+
+    # File system events that can affect a composed prompt
+    watched_event_types = [FileCreatedEvent, FileModifiedEvent, FileDeletedEvent, FileMovedEvent]
+
     restart_queue = queue.Queue()
     dependencies = composer.get_all_dependencies()
     watch_paths = {p.parent for p in dependencies}
 
-    handler = ChangeHandler(composer, agent_names, restart_queue)
-    observer = Observer()
+    handler = ChangeHandler(composer, agent_names, restart_queue, retry_agents)
     
     if not watch_paths:
         ui.warning("No dependencies found to watch. Watching only the config file's directory.")
         watch_paths.add(composer.base_dir)
 
+    observer = _create_observer(watch_paths, watch_interval)
+
+    # Dependencies are plain files, so only their own directories need watching.
+    # Non-recursive watches keep activity in unrelated subdirectories (such as the
+    # output directory) out of the event stream, and the event filter drops
+    # open/close/access events before they ever reach the handler.
     for path in watch_paths:
-        observer.schedule(handler, str(path), recursive=True)
+        observer.schedule(handler, str(path), recursive=False, event_filter=watched_event_types)
     
     observer.start()
     ui.info(f"Watching for changes in {len(watch_paths)} directories... Press Ctrl+C to stop.")
     try:
-        # Block until a restart is signaled
-        new_composer = restart_queue.get()
+        # Block until a restart is signaled. Waiting in short slices keeps the
+        # main thread responsive to Ctrl+C, since an untimed lock wait is not
+        # interruptible on every platform.
+        while True:
+            try:
+                restart = restart_queue.get(timeout=0.5)
+                break
+            except queue.Empty:
+                continue
         
         ui.info("Signaled for watcher restart...")
-        return new_composer  # Return the new composer to the controlling loop
+        return restart  # Return the composer to the controlling loop
 
     except KeyboardInterrupt:
         ui.info("Stopping watcher...")
@@ -306,31 +660,33 @@ def _run_watcher(composer: PromptComposer, agent_names: List[str]):
     finally:
         if observer.is_alive():
             observer.stop()
-            observer.join()
+            observer.join(timeout=2.0)
         ui.info("Watcher stopped.")
 
 
-@contextmanager
-def suppress_stdout():
-    """A context manager that redirects stdout to devnull using UTF-8 encoding."""
-    original_stdout = sys.stdout
-    with open(os.devnull, 'w', encoding="utf-8") as devnull:
-        sys.stdout = devnull
-        try:
-            yield
-        finally:
-            sys.stdout = original_stdout
-
-
 @app.command()
 def compose(
     agent_names: Annotated[List[str], typer.Argument(help="Specific agent(s) to compose. If empty, all agents will be composed.")] = None,
     config_path: Annotated[Path, typer.Option("--config", "-c", help="Path to the prompts.yml configuration file or directory containing the project structure. Defaults to '.prompt_scribe/prompts.yml'. Use this option when your project was initialized in a custom location.")] = Path(".prompt_scribe/prompts.yml"),
     watch: bool = typer.Option(False, "--watch", "-w", help="Watch for file changes and recompose automatically."),
+    watch_interval: float = typer.Option(
+        None,
+        "--watch-interval",
+        min=0.1,
+        help=f"Poll for changes every N seconds instead of using native file system notifications. Polling is enabled automatically (every {DEFAULT_POLLING_INTERVAL:g}s) for projects on network file systems.",
+    ),
+    processes: bool = typer.Option(
+        False,
+        "--processes",
+        "-p",
+        help="Compose agents in parallel worker processes, one per CPU core. Speeds up large projects with heavy templates; startup overhead makes it slower for small ones.",
+    ),
 ):
     """
     Composes final prompt files from templates and includes.
     """
+    from .composer import PromptComposer
+
     # Handle case where user provides a directory path (like 'preview') instead of full config file path
     resolved_path = config_path.resolve()
     
@@ -347,16 +703,18 @@ def compose(
         ui.info("Did you forget to run 'prompt-scribe init'? You can also specify a custom config path with --config/-c.")
         raise typer.Exit(code=1)
 
-    _compose_agents(composer, agent_names or [])
+    # Recompositions in watch mode always run in-process, as they rely on the composer's state
+    _compose_agents(composer, agent_names or [], processes=processes)
 
     if watch:
         ui.info("Initial dependency analysis for watch mode...")
-        with suppress_stdout():
+        with ui.muted():
             composer.analyze_dependencies()
 
-        current_composer = composer
+        restart = (composer, frozenset())
         
-        while current_composer:
-            current_composer = _run_watcher(current_composer, agent_names or [])
+        while restart:
+            current_composer, retry_agents = restart
+            restart = _run_watcher(current_composer, agent_names or [], watch_interval, retry_agents)
         
         ui.info("Watcher process finished.")
\ No newline at end of file
@@ -9,8 +9,15 @@ to generate the final prompt files.
 
 @copyright: (c) 2025 by The Scribe Works.
 """
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import jinja2
 import yaml
@@ -19,7 +26,163 @@ from mdformat.renderer import MDRenderer
 
 from .ui import ui
 
+# Prefer the LibYAML-based loader; PyYAML is not always built with libyaml support.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 MAX_SUBSTITUTION_DEPTH = 10
+# Upper bound for compiled substitution templates kept per composer
+MAX_COMPILED_TEMPLATES = 512
+# Agents are dry-run concurrently during dependency analysis; bounded like the CLI's compose pool
+MAX_ANALYSIS_WORKERS = 8
+# Upper bound for threads reading an agent's included files ahead of assembly
+MAX_PREFETCH_WORKERS = 8
+
+
+# Matches every line that could be a heading: an ATX heading ('# Title') or a setext
+# underline ('===', '---'), optionally nested in blockquotes or list items. It
+# deliberately over-matches (thematic breaks, code blocks); it only has to prove
+# that a document contains no headings at all.
+_HEADING_CANDIDATE_RE = re.compile(r"^[ \t>*+\-\d.)]*(?:#{1,6}(?:[ \t]|$)|(?:=+|-+)[ \t]*$)", re.MULTILINE)
+
+
+def _has_template_syntax(text: str) -> bool:
+    """Checks whether a string contains any of Jinja's default delimiters."""
+    return "{{" in text or "{%" in text or "{#" in text
+
+
+def _render_plain(text: str) -> str:
+    """
+    Returns what rendering a string without template syntax would produce:
+    Jinja normalizes line endings and drops a single trailing newline.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text[:-1] if text.endswith("\n") else text
+
+
+# Assembly step keys: headings map to their Markdown prefix, the others are used verbatim
+_HEADING_PREFIXES = {f"h{level}": "#" * level + " " for level in range(1, 7)}
+_PASSTHROUGH_STEPS = frozenset(("content", "separator"))
+
+# A bare variable placeholder ('{{ name }}'), the most common template syntax by far
+_SIMPLE_PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+# Names Jinja parses as constants or operators rather than as variables
+_JINJA_RESERVED_NAMES = frozenset(
+    ("true", "false", "none", "True", "False", "None", "and", "or", "not", "in", "is", "if", "else", "self")
+)
+
+
+def _render_simple(text: str, variables: Dict[str, Any]) -> Optional[str]:
+    """
+    Renders a string whose only template syntax is bare placeholders of defined
+    variables, producing the same result as Jinja.
+
+    Returns None if the string needs the template engine, e.g. for filters,
+    blocks, comments, or undefined variables (whose warnings Jinja handles).
+    """
+    # Odd items are placeholder names, even items the literal text around them
+    pieces = _SIMPLE_PLACEHOLDER_RE.split(_render_plain(text))
+    for i in range(0, len(pieces), 2):
+        literal = pieces[i]
+        if _has_template_syntax(literal) or (literal.endswith("{") and i + 1 < len(pieces)):
+            return None
+    for i in range(1, len(pieces), 2):
+        name = pieces[i]
+        if name in _JINJA_RESERVED_NAMES or name not in variables:
+            return None
+        pieces[i] = str(variables[name])
+    return "".join(pieces)
+
+
+def _literal_include_paths(assembly_steps: List[Any]) -> List[str]:
+    """Returns the paths of all include steps whose path needs no variable substitution."""
+    paths = []
+    for step in assembly_steps:
+        if not isinstance(step, dict) or not step:
+            continue
+        key = next(iter(step))
+        value = step[key]
+        if key not in ('include', 'include_raw'):
+            continue
+        path = value.get('path', '') if isinstance(value, dict) else value
+        if isinstance(path, str) and path.strip() and not _has_template_syntax(path):
+            paths.append(_render_plain(path))
+    return paths
+
+
+def _read_bytes(path: Path, size_hint: int) -> bytes:
+    """
+    Reads a whole file with plain system calls. 'size_hint' is the size from a
+    preceding stat, which lets the first read fetch the entire file.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        data = os.read(fd, size_hint + 1)
+        # Only a file that grew since the stat needs further reads
+        while chunk := os.read(fd, 65536):
+            data += chunk
+    finally:
+        os.close(fd)
+    return data
+
+
+def _write_text(path: Path, text: str) -> None:
+    """
+    Writes a string to a file as UTF-8 with the platform's line endings, like
+    'Path.write_text', but with plain system calls instead of a buffered text stream.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    data = memoryview(text.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Converts mappings into lists of key/value pairs sorted by their 'repr', which
+    orders keys of any type and keeps keys like 1 and '1' apart.
+    """
+    if isinstance(value, dict):
+        return ["mapping", sorted(([_canonical(k), _canonical(v)] for k, v in value.items()), key=repr)]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def _fingerprint(value: Any) -> bytes:
+    """Returns a compact, order-independent hash of a YAML-derived value."""
+    try:
+        canonical = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    except TypeError:
+        # YAML mappings may mix key types (e.g. {1: a, name: b}), which cannot be sorted
+        canonical = json.dumps(_canonical(value), default=str, ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+class _SubstitutionContext(threading.local):
+    """
+    Per-thread context for the shared substitution environment, so that
+    agents composed concurrently do not overwrite each other's state.
+    """
+    file_path = None
+    warn = True
+    # Names of undefined variables already reported for the current substitution
+    warned = frozenset()
+    # Variables of the render in progress, read by the 'read_file' helpers
+    variables = None
+    # Messages reported while variables are resolved, as (ui method name, message)
+    reports = None
+    # Included files substituted for the agent being composed:
+    # path -> (content, variables, result)
+    results = None
 
 
 class PromptScribeError(Exception):
@@ -27,6 +190,32 @@ class PromptScribeError(Exception):
     pass
 
 
+# The composer of a 'compose_all' worker process, shared by all agents it composes
+_worker_composer = None
+
+
+def _init_compose_worker(config_path: str) -> None:
+    """Loads the configuration once per worker process."""
+    global _worker_composer
+    with ui.muted():
+        _worker_composer = PromptComposer(config_path)
+
+
+def _compose_agent_in_worker(agent_name: str) -> Tuple[list, Exception | None]:
+    """
+    Composes a single agent in a worker process while collecting its console output.
+
+    Returns:
+        The collected messages and the exception raised, if any.
+    """
+    with ui.deferred() as messages:
+        try:
+            _worker_composer.compose_agent(agent_name)
+        except Exception as e:
+            return messages, e
+    return messages, None
+
+
 class PromptComposer:
     """Orchestrates the prompt composition process."""
 
@@ -43,17 +232,30 @@ class PromptComposer:
                 f"Configuration file not found at '{self.config_path}'"
             )
         self.base_dir = self.config_path.parent
+        self._base_dir_str = str(self.base_dir)
+        self._resolve_path_cached = functools.lru_cache(maxsize=4096)(self._resolve_path_uncached)
+        # Working directory that paths in log messages are shown relative to
+        self._cwd = Path.cwd()
+        self._config_stat = self._stat_config()
         self.config = self._load_config()
+        # Computed on first use, as only watch mode compares configurations
+        self._config_fingerprints = None
         self.dependencies: Dict[str, set] = {}  # agent -> {file_path}
+        self._file_cache: Dict[Path, Tuple[Tuple[int, int], str]] = {}  # resolved file_path -> ((mtime, size), content)
+        # (resolved file_path, fit level) -> (source content, processed content)
+        self._markdown_cache: Dict[Tuple[Path, int], Tuple[str, str]] = {}
+        # agent -> (context fingerprint, resolved variables, files read while resolving,
+        #           messages reported while resolving)
+        self._resolved_vars_cache: Dict[str, Tuple[bytes, Dict[str, Any], frozenset, tuple]] = {}
 
         # Initialize Markdown tools once for efficiency
         self.md_parser = MarkdownIt()
         self.md_renderer = MDRenderer()
 
         # Substitution context for the shared Jinja environment.
-        # This dictionary will be updated before each substitution call to provide
+        # This context will be updated before each substitution call to provide
         # a file path context to the WarningUndefined handler.
-        self._subst_context = {"file_path": None, "warn": True}
+        self._subst_context = _SubstitutionContext()
         
         # Capture 'self' for use within the nested class, allowing the Undefined handler
         # to access the composer instance's dynamic context.
@@ -62,21 +264,37 @@ class PromptComposer:
             """Custom Undefined class to show contextual warnings but not crash."""
             def __str__(self):
                 context = composer_instance._subst_context
-                if context["warn"]:
-                    location = f" (in file '{context['file_path']}')" if context['file_path'] else ""
-                    ui.warning(f"Variable '{self._undefined_name}' is not defined in 'prompts.yml'{location}. Leaving it untouched.")
+                # Warn once per name and substitution, not for every occurrence
+                if context.warn and self._undefined_name not in context.warned:
+                    context.warned.add(self._undefined_name)
+                    location = f" (in file '{context.file_path}')" if context.file_path else ""
+                    composer_instance._report("warning", f"Variable '{self._undefined_name}' is not defined in 'prompts.yml'{location}. Leaving it untouched.")
                 return f"{{{{ {self._undefined_name} }}}}"
         
         # A single, reusable Jinja2 environment for all string substitutions.
         # Its 'undefined' handler is configured to use the dynamic context from '_subst_context'.
         self.subst_env = jinja2.Environment(undefined=WarningUndefined, autoescape=False)
+        self.subst_env.globals.update(self._jinja_helpers())
+        # Compiled templates by source text, as the same strings are substituted over and over
+        self._compile_cache: Dict[str, jinja2.Template] = {}
+        # Agents are composed in threads; eviction iterates the cache and must not race inserts
+        self._compile_cache_lock = threading.Lock()
+        # Compiled included files: path as given -> (source content, template)
+        self._include_template_cache: Dict[str, Tuple[str, jinja2.Template]] = {}
+        # Template-mode environments by templates directory, shared by all agents
+        self._template_envs: Dict[Path, jinja2.Environment] = {}
 
     def _load_config(self) -> Dict[str, Any]:
         """Loads and validates the main YAML configuration file."""
-        ui.info(f"Loading configuration from '{self.config_path.relative_to(Path.cwd())}'")
+        ui.info(f"Loading configuration from '{self._display_path(self.config_path)}'")
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
+            # The loader decodes the bytes itself (UTF-8 unless a BOM says otherwise),
+            # which saves a separate decoding pass in Python. Given the whole file
+            # at once, LibYAML scans it in memory instead of calling back into
+            # Python for every chunk.
+            with open(self.config_path, "rb") as f:
+                data = f.read()
+            return yaml.load(data, Loader=_YamlLoader)
         except yaml.YAMLError as e:
             ui.error(f"Error parsing YAML file: {e}")
             raise PromptScribeError(f"Error parsing YAML file: {e}")
@@ -84,16 +302,93 @@ class PromptComposer:
             ui.error(f"Failed to read config file: {e}")
             raise PromptScribeError(f"Failed to read config file: {e}")
 
+    def _stat_config(self) -> Tuple[int, int]:
+        """Returns the (mtime, size) pair used to detect changes of the config file."""
+        stat = self.config_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reloads the configuration if the config file has changed on disk.
+
+        Cached file contents are kept, while everything derived from the old
+        configuration (resolved variables, dependencies) and the resolved paths,
+        which may follow re-pointed symlinks now, are discarded. If the
+        new configuration cannot be loaded, the current one stays in effect.
+
+        Returns:
+            True if the configuration was reloaded, False if it was unchanged.
+        """
+        config_stat = self._stat_config()
+        if config_stat == self._config_stat:
+            return False
+
+        self.config = self._load_config()
+        self._config_stat = config_stat
+        self._config_fingerprints = None
+        self._resolved_vars_cache.clear()
+        self._resolve_path_cached.cache_clear()
+        self.dependencies = {}
+        return True
+
+    @property
+    def config_fingerprints(self) -> Dict[str, Any]:
+        """
+        Hashes of the current configuration's sections (see
+        '_compute_config_fingerprints'), computed once per loaded configuration.
+        """
+        if self._config_fingerprints is None:
+            self._config_fingerprints = self._compute_config_fingerprints()
+        return self._config_fingerprints
+
+    def _compute_config_fingerprints(self) -> Dict[str, Any]:
+        """
+        Hashes the configuration sections, so that two configurations can be
+        compared cheaply (e.g. in watch mode).
+
+        Returns:
+            A dictionary with 'settings' and 'variables' hashes and a per-agent
+            mapping of hashes under 'agents'.
+        """
+        config = self.config or {}
+        return {
+            'settings': _fingerprint(config.get('settings')),
+            'variables': _fingerprint(config.get('variables')),
+            'agents': {
+                name: _fingerprint(agent_config)
+                for name, agent_config in (config.get('agents') or {}).items()
+            },
+        }
+
     def get_all_agent_names(self) -> List[str]:
         """Returns a list of all configured agent names."""
         return list(self.config.get("agents", {}).keys())
 
+    def _display_path(self, path: Path) -> str:
+        """Formats a path relative to the working directory for log messages."""
+        try:
+            return str(path.relative_to(self._cwd))
+        except ValueError:
+            return str(path)
+
     def _resolve_path(self, relative_path: str) -> Path:
-        """Resolves a path relative to the config file's location."""
-        path = Path(relative_path)
-        if path.is_absolute():
-            return path
-        return (self.base_dir / path).resolve()
+        """
+        Resolves a path relative to the config file's location.
+
+        The same few paths are resolved for every include, agent and watch event,
+        and resolving them costs a 'realpath' (several syscalls) each time, so
+        results are cached per composer. As 'realpath' follows symlinks on disk,
+        the cache is cleared whenever files or the configuration change.
+        """
+        return self._resolve_path_cached(relative_path)
+
+    def _resolve_path_uncached(self, relative_path: str) -> Path:
+        """Resolves a path relative to the config file's location without caching."""
+        # Joined and resolved as strings; pathlib would build intermediate objects
+        # for every step. Callers still get a Path.
+        if os.path.isabs(relative_path):
+            return Path(relative_path)
+        return Path(os.path.realpath(os.path.join(self._base_dir_str, relative_path)))
 
     def _process_markdown_content(self, content: str, fit_level: int) -> str:
         """
@@ -107,6 +402,11 @@ class PromptComposer:
         Returns:
             The processed Markdown content with adjusted headings.
         """
+        # Content without any heading-like line is returned unchanged anyway,
+        # so the parse and render round-trip can be skipped.
+        if not _HEADING_CANDIDATE_RE.search(content):
+            return content
+
         tokens = self.md_parser.parse(content)
 
         highest_level_found = 7
@@ -132,20 +432,98 @@ class PromptComposer:
 
         return self.md_renderer.render(tokens, self.md_parser.options, {})
 
+    def _load_file(self, file_path: Path) -> str:
+        """Returns the content of a resolved file, served from the cache while it is unchanged."""
+        # A stat is much cheaper than reading and decoding the file again,
+        # and keeps the cache valid for long-lived composers (watch mode).
+        # The size catches rewrites within the file system's timestamp resolution.
+        stat = file_path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(file_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        # Reading bytes and decoding them in one go skips the text layer; its only
+        # effect on a whole-file read, newline translation, is applied explicitly.
+        content = _read_bytes(file_path, stat.st_size).decode("utf-8")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        self._file_cache[file_path] = (version, content)
+        return content
+
+    def _prefetch_files(self, file_path_strs: Iterable[str]) -> None:
+        """
+        Loads files that are not cached yet concurrently, so that their I/O waits
+        overlap and the following sequential reads are served from the cache.
+        Errors are ignored here; they are reported by the regular read.
+        """
+        uncached = set()
+        for file_path_str in file_path_strs:
+            try:
+                file_path = self._resolve_path(file_path_str)
+            except (OSError, ValueError):
+                continue
+            if file_path not in self._file_cache:
+                uncached.add(file_path)
+        if len(uncached) < 2:
+            return
+
+        def load_quietly(file_path: Path) -> None:
+            try:
+                self._load_file(file_path)
+            except Exception:
+                pass
+
+        with ThreadPoolExecutor(max_workers=min(MAX_PREFETCH_WORKERS, len(uncached))) as executor:
+            list(executor.map(load_quietly, uncached))
+
     def _read_file_content(self, file_path_str: str, agent_name: str) -> str:
         """Reads content from a file, handling potential errors and recording dependencies."""
         try:
             file_path = self._resolve_path(file_path_str)
             if agent_name and agent_name in self.dependencies:
                 self.dependencies[agent_name].add(file_path)
-            return file_path.read_text(encoding="utf-8")
+            return self._load_file(file_path)
         except FileNotFoundError:
-            ui.warning(f"File not found during substitution: '{file_path_str}'")
+            self._report("warning", f"File not found during substitution: '{file_path_str}'")
             return ""
         except Exception as e:
-            ui.error(f"Failed to read file '{file_path_str}': {e}")
+            self._report("error", f"Failed to read file '{file_path_str}': {e}")
             raise PromptScribeError(f"Failed to read file '{file_path_str}': {e}")
 
+    def invalidate(self, file_paths: Iterable[Path]) -> None:
+        """
+        Drops cached content of changed files, so that they are read again
+        the next time an agent uses them.
+
+        Args:
+            file_paths: Resolved paths of the files that have changed.
+        """
+        changed = {Path(file_path) for file_path in file_paths}
+        for file_path in changed:
+            self._file_cache.pop(file_path, None)
+        for key in [key for key in self._markdown_cache if key[0] in changed]:
+            self._markdown_cache.pop(key, None)
+        # Resolved paths follow symlinks, which may have been re-pointed as well
+        self._resolve_path_cached.cache_clear()
+
+        # Variables that read one of the changed files have to be resolved again
+        stale_agents = [
+            agent_name for agent_name, (_, _, var_deps, _) in self._resolved_vars_cache.items()
+            if not changed.isdisjoint(var_deps)
+        ]
+        for agent_name in stale_agents:
+            self._resolved_vars_cache.pop(agent_name, None)
+
+    def _report(self, level: str, message: str) -> None:
+        """
+        Prints a warning or error ('level' names the 'ui' method) and records it
+        for the variable resolution in progress, if any.
+        """
+        getattr(ui, level)(message)
+        reports = self._subst_context.reports
+        if reports is not None:
+            reports.append((level, message))
+
     def _resolve_variables(self, agent_name: str, extra_context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Resolves and merges global and agent-specific variables.
@@ -156,25 +534,43 @@ class PromptComposer:
 
         Returns:
             A dictionary of resolved variables.
+
+        The result is cached per agent until the configuration is reloaded or
+        a file read during resolution is invalidated. Warnings and errors
+        reported during resolution are cached along with it and reported
+        again whenever the cached result is used.
         """
-        agent_config = self.config.get("agents", {}).get(agent_name, {})
-        global_vars = self.config.get("variables", {}).copy()
-        agent_vars = agent_config.get("variables", {}).copy()
+        context_key = _fingerprint(extra_context)
+        cached = self._resolved_vars_cache.get(agent_name)
+        if cached is not None and cached[0] == context_key:
+            # Files read by variables are still dependencies of the agent
+            if agent_name in self.dependencies:
+                self.dependencies[agent_name].update(cached[2])
+            for level, message in cached[3]:
+                getattr(ui, level)(message)
+            return cached[1]
 
-        merged_vars = {**global_vars, **agent_vars}
+        agent_config = self.config.get("agents", {}).get(agent_name, {})
+        # Merging into a new dict already leaves the configuration untouched
+        merged_vars = {**self.config.get("variables", {}), **agent_config.get("variables", {})}
         merged_vars['_agent_name'] = agent_name
         if extra_context:
             merged_vars.update(extra_context)
 
         final_vars = {}
-        for key, value in merged_vars.items():
-            if isinstance(value, str):
-                final_vars[key] = self._substitute_variables(
-                    value, merged_vars
-                )
-            else:
-                final_vars[key] = value
+        context = self._subst_context
+        context.reports = reports = []
+        try:
+            for key, value in merged_vars.items():
+                if isinstance(value, str):
+                    final_vars[key] = self._substitute_variables(value, merged_vars)
+                else:
+                    final_vars[key] = value
+        finally:
+            context.reports = None
 
+        var_deps = frozenset(self.dependencies.get(agent_name, ())) - {self.config_path}
+        self._resolved_vars_cache[agent_name] = (context_key, final_vars, var_deps, tuple(reports))
         return final_vars
 
     def _get_and_process_file_content(self, path: str, agent_name: str, **kwargs: Any) -> str:
@@ -188,69 +584,158 @@ class PromptComposer:
         # Step 2: Apply heading processing if requested
         fit_level = kwargs.get('fit_headings')
         if fit_level is not None:
-            content = self._process_markdown_content(content, int(fit_level))
+            fit_level = int(fit_level)
+            # Shared includes are processed once per file version. The cached result
+            # is only valid for the very content object it was computed from.
+            key = (self._resolve_path(path), fit_level)
+            cached = self._markdown_cache.get(key)
+            if cached is not None and cached[0] is content:
+                return cached[1]
+            processed = self._process_markdown_content(content, fit_level)
+            self._markdown_cache[key] = (content, processed)
+            content = processed
             
         return content
 
-    def _get_jinja_helpers(self, agent_name: str, variables: Dict[str, Any]) -> Dict[str, Callable]:
+    def _jinja_read_file(self, path: str, **kwargs: Any) -> str:
         """
-        A factory that creates and returns file reading helper functions
-        for a Jinja2 environment. This centralizes the logic and avoids code duplication.
+        The 'read_file' Jinja helper: reads, processes, and substitutes variables in a file.
+        The agent and its variables are those of the current thread's render.
         """
-        def read_file_wrapper(path: str, **kwargs: Any) -> str:
-            """Reads, processes, and substitutes variables in a file."""
-            if isinstance(path, jinja2.Undefined):
-                ui.warning(f"Path variable '{path._undefined_name}' is not defined in 'prompts.yml'. Skipping file read.")
-                return ""
-            
-            if not isinstance(path, str) or not path.strip():
-                ui.warning(f"Invalid path provided to 'read_file': '{path}'. Skipping file read.")
-                return ""
-            
-            content = self._get_and_process_file_content(path, agent_name, **kwargs)
-            substitute = variables.get('_settings', {}).get('substitute_in_includes', True)
-            if substitute:
-                return self._substitute_variables(content, variables, file_path_context=path)
-            return content
-        
-        def read_file_raw_wrapper(path: str, **kwargs: Any) -> str:
-            """Reads and processes a file, but skips variable substitution."""
-            if isinstance(path, jinja2.Undefined):
-                ui.warning(f"Path variable '{path._undefined_name}' is not defined in 'prompts.yml'. Skipping file read.")
-                return ""
-            
-            if not isinstance(path, str) or not path.strip():
-                ui.warning(f"Invalid path provided to 'read_file_raw': '{path}'. Skipping file read.")
-                return ""
-               
-            return self._get_and_process_file_content(path, agent_name, **kwargs)
+        if isinstance(path, jinja2.Undefined):
+            self._report("warning", f"Path variable '{path._undefined_name}' is not defined in 'prompts.yml'. Skipping file read.")
+            return ""
 
+        if not isinstance(path, str) or not path.strip():
+            self._report("warning", f"Invalid path provided to 'read_file': '{path}'. Skipping file read.")
+            return ""
+
+        variables = self._subst_context.variables
+        content = self._get_and_process_file_content(path, variables.get('_agent_name', ''), **kwargs)
+        substitute = variables.get('_settings', {}).get('substitute_in_includes', True)
+        if substitute:
+            return self._substitute_variables(content, variables, file_path_context=path)
+        return content
+
+    def _jinja_read_file_raw(self, path: str, **kwargs: Any) -> str:
+        """The 'read_file_raw' Jinja helper: reads and processes a file, but skips variable substitution."""
+        if isinstance(path, jinja2.Undefined):
+            self._report("warning", f"Path variable '{path._undefined_name}' is not defined in 'prompts.yml'. Skipping file read.")
+            return ""
+
+        if not isinstance(path, str) or not path.strip():
+            self._report("warning", f"Invalid path provided to 'read_file_raw': '{path}'. Skipping file read.")
+            return ""
+
+        variables = self._subst_context.variables
+        return self._get_and_process_file_content(path, variables.get('_agent_name', ''), **kwargs)
+
+    def _jinja_helpers(self) -> Dict[str, Callable]:
+        """The file reading helpers registered as globals of every Jinja2 environment."""
         return {
-            'read_file': read_file_wrapper,
-            'read_file_raw': read_file_raw_wrapper,
+            'read_file': self._jinja_read_file,
+            'read_file_raw': self._jinja_read_file_raw,
         }
     
-    def _substitute_variables(self, text: str, variables: Dict[str, Any], file_path_context: str = None) -> str:
+    def _get_template_env(self, templates_dir: Path) -> jinja2.Environment:
+        """
+        Returns the environment for a templates directory, creating it on first use.
+
+        Reusing the environment lets Jinja load and compile each template once and
+        reload it only when its source changes; the bytecode cache (in Jinja's
+        per-user temporary directory) also skips compilation across runs.
+        """
+        env = self._template_envs.get(templates_dir)
+        if env is not None:
+            return env
+
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(str(templates_dir)),
+            bytecode_cache=jinja2.FileSystemBytecodeCache(),
+            # Keep every loaded template; their number is bounded by the templates directory
+            cache_size=-1,
+            autoescape=False,
+        )
+
+        env.globals.update(self._jinja_helpers())
+
+        return self._template_envs.setdefault(templates_dir, env)
+
+    def _compile(self, text: str, file_path: str = None) -> jinja2.Template:
+        """
+        Compiles a string with the shared substitution environment, reusing earlier results.
+
+        Included files (given with their 'file_path') are cached separately, so that
+        they are compiled once per file version and not evicted by short strings.
+        A cached template is only used for the very content object it was compiled
+        from, which changes whenever the file is read again.
+        """
+        if file_path is not None:
+            cached = self._include_template_cache.get(file_path)
+            if cached is not None and cached[0] is text:
+                return cached[1]
+            template = self.subst_env.from_string(text)
+            self._include_template_cache[file_path] = (text, template)
+            return template
+
+        template = self._compile_cache.get(text)
+        if template is None:
+            template = self.subst_env.from_string(text)
+            with self._compile_cache_lock:
+                if len(self._compile_cache) >= MAX_COMPILED_TEMPLATES:
+                    # Evict the oldest entry (dicts keep insertion order)
+                    self._compile_cache.pop(next(iter(self._compile_cache)), None)
+                self._compile_cache[text] = template
+        return template
+
+    def _substitute_variables(
+        self,
+        text: str,
+        variables: Dict[str, Any],
+        file_path_context: str = None,
+    ) -> str:
         """
         Renders a string using a shared, reusable Jinja2 environment for performance.
         It allows for consistent variable and function syntax (e.g., {{ my_var }},
         {{ read_file(...) }}) across all parts of the configuration.
         """
+        # Most values and included files contain no template syntax at all
+        if not _has_template_syntax(text):
+            return _render_plain(text)
+
+        # Plain placeholders are replaced directly, without a template render
+        rendered = _render_simple(text, variables)
+        if rendered is not None:
+            return rendered
+
+        context = self._subst_context
+        results = context.results if file_path_context is not None else None
+        if results is not None:
+            cached = results.get(file_path_context)
+            if cached is not None and cached[0] is text and cached[1] is variables:
+                return cached[2]
+
         # Configure the context for the shared environment's undefined handler
-        self._subst_context["file_path"] = file_path_context
-        self._subst_context["warn"] = variables.get('_settings', {}).get('warn_on_missing', True)
+        context.file_path = file_path_context
+        context.warn = variables.get('_settings', {}).get('warn_on_missing', True)
+        context.warned = set()
 
-        # Helpers need to be updated for each call as they depend on the variable context
-        helpers = self._get_jinja_helpers(variables.get('_agent_name', ''), variables)
-        self.subst_env.globals.update(helpers)
+        # The helpers are globals of the shared environment and read the variables
+        # from the thread's context, which keeps them thread-safe. As with any
+        # global, variables of the same name take precedence.
+        context.variables = variables
 
         try:
-            template = self.subst_env.from_string(text)
-            return template.render(variables)
+            template = self._compile(text, file_path_context)
+            rendered = template.render(variables)
         except (jinja2.TemplateError, TypeError) as e:
-            ui.error(f"Error during string substitution: {e}")
+            self._report("error", f"Error during string substitution: {e}")
             return text  # Return original text on failure
 
+        if results is not None:
+            results[file_path_context] = (text, variables, rendered)
+        return rendered
+
     def _run_simple_assembly(self, agent_config: dict, variables: dict, agent_name: str) -> str:
         """
         Builds the prompt from a sequence of assembly steps.
@@ -266,10 +751,14 @@ class PromptComposer:
         parts = []
         assembly_steps = agent_config.get('assembly', [])
 
+        # Literal include paths are known up front, so their files can be read concurrently
+        self._prefetch_files(_literal_include_paths(assembly_steps))
+
         for step in assembly_steps:
             if not isinstance(step, dict) or not step:
                 continue
-            key, value = next(iter(step.items()))
+            key = next(iter(step))
+            value = step[key]
 
             if key == 'include' or key == 'include_raw':
                 path, fit_level = "", None
@@ -304,21 +793,29 @@ class PromptComposer:
 
                 if not is_raw and variables.get('_settings', {}).get('substitute_in_includes', True):
                     # БЕЗ ИЗМЕНЕНИЙ: Использование file_path_context, как в вашем коде
-                    parts.append(self._substitute_variables(file_content, variables, file_path_context=resolved_path))
+                    part = self._substitute_variables(file_content, variables, file_path_context=resolved_path)
                 else:
-                    parts.append(file_content)
+                    part = file_content
             else:
                 # All other keys (content, h1, etc.) are processed by the Jinja-powered substituter
                 processed_value = self._substitute_variables(str(value), variables)
-                if key == 'content':
-                    parts.append(processed_value)
-                elif key == 'separator':
-                    parts.append(processed_value)
+                prefix = _HEADING_PREFIXES.get(key)
+                if prefix is not None:
+                    part = prefix + processed_value
+                elif key in _PASSTHROUGH_STEPS:
+                    part = processed_value
                 elif key.startswith('h') and key[1:].isdigit():
+                    # Heading levels beyond Markdown's six are rare but accepted
                     level = int(key[1:])
-                    parts.append(f"{'#' * level} {processed_value}")
+                    part = f"{'#' * level} {processed_value}"
+                else:
+                    continue
+
+            # Parts are stripped as they are collected, so joining them copies each only once
+            if part:
+                parts.append(part.strip())
 
-        return "\n\n".join(p.strip() for p in parts if p)
+        return "\n\n".join(parts)
 
     def get_reverse_dependencies(self) -> Dict[Path, List[str]]:
         """
@@ -335,14 +832,73 @@ class PromptComposer:
                 reverse_deps[file_path].append(agent_name)
         return reverse_deps
 
-    def analyze_dependencies(self) -> None:
-        """Runs a dry run of all agents to populate the dependency map."""
-        for agent_name in self.get_all_agent_names():
+    def _analyze_agent(self, agent_name: str) -> None:
+        """Dry-runs a single agent to record its dependencies."""
+        try:
+            self.compose_agent(agent_name, dry_run=True)
+        except PromptScribeError as e:
+            # In a dry run, we can tolerate some errors, but we should warn.
+            ui.warning(f"Could not fully analyze dependencies for agent '{agent_name}': {e}")
+
+    def _analyze_agent_deferred(self, agent_name: str) -> Tuple[list, Exception | None]:
+        """
+        Dry-runs a single agent while collecting its console output.
+
+        Returns:
+            The collected messages and the exception raised, if any.
+        """
+        with ui.deferred() as messages:
             try:
-                self.compose_agent(agent_name, dry_run=True)
-            except PromptScribeError as e:
-                # In a dry run, we can tolerate some errors, but we should warn.
-                ui.warning(f"Could not fully analyze dependencies for agent '{agent_name}': {e}")
+                self._analyze_agent(agent_name)
+            except Exception as e:
+                return messages, e
+        return messages, None
+
+    def analyze_dependencies(self) -> None:
+        """
+        Runs a dry run of all agents to populate the dependency map.
+
+        Agents are analyzed concurrently; the output of each agent is printed
+        as one block, in configuration order.
+        """
+        agent_names = self.get_all_agent_names()
+        if len(agent_names) <= 1:
+            for agent_name in agent_names:
+                self._analyze_agent(agent_name)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(MAX_ANALYSIS_WORKERS, len(agent_names))) as executor:
+            futures = [executor.submit(self._analyze_agent_deferred, name) for name in agent_names]
+            for future in futures:
+                messages, error = future.result()
+                ui.flush(messages)
+                if error is not None:
+                    raise error
+
+    def compose_all(self, agent_names: List[str]) -> Iterator[Tuple[str, list, Exception | None]]:
+        """
+        Composes agents in worker processes, so that CPU-bound rendering uses all cores.
+
+        Each worker loads the configuration once and composes its share of the
+        agents. The dependencies and caches of this composer are not updated,
+        so watch mode keeps using 'compose_agent'.
+
+        Args:
+            agent_names: The agents to compose.
+
+        Yields:
+            Tuples of (agent name, collected messages, exception raised or None),
+            in the order of 'agent_names'. Print the messages with 'ui.flush()'.
+        """
+        max_workers = min(os.cpu_count() or 1, len(agent_names))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_compose_worker,
+            initargs=(str(self.config_path),),
+        ) as executor:
+            results = executor.map(_compose_agent_in_worker, agent_names)
+            for agent_name, (messages, error) in zip(agent_names, results):
+                yield agent_name, messages, error
 
     def get_all_dependencies(self) -> set[Path]:
         """Returns a set of all unique file paths that agents depend on."""
@@ -365,6 +921,8 @@ class PromptComposer:
             raise PromptScribeError(f"Agent '{agent_name}' not found in configuration.")
 
         self.dependencies[agent_name] = {self.config_path}
+        # Files included several times are substituted once per composition
+        self._subst_context.results = {}
         ui.title(f"Composing agent: '{agent_name}'")
 
         settings = self.config.get("settings", {})
@@ -396,10 +954,8 @@ class PromptComposer:
             ui.info(f"Using template: '{template_name}'")
 
             templates_dir = self._resolve_path(settings.get("templates_dir", "templates"))
-            env = jinja2.Environment(loader=jinja2.FileSystemLoader(str(templates_dir)), autoescape=False)
-            
-            helpers = self._get_jinja_helpers(agent_name, variables)
-            env.globals.update(helpers)
+            env = self._get_template_env(templates_dir)
+            self._subst_context.variables = variables
 
             try:
                 self.dependencies[agent_name].add((templates_dir / template_name).resolve())
@@ -407,6 +963,8 @@ class PromptComposer:
             except Exception as e:
                 ui.error(f"Jinja2 rendering failed: {e}")
                 raise PromptScribeError(f"Jinja2 rendering failed: {e}")
+            finally:
+                self._subst_context.variables = None
 
         if not dry_run:
             output_dir_template = settings.get("output_dir", "composed_prompts")
@@ -419,7 +977,11 @@ class PromptComposer:
             else:
                 output_file_path = output_dir / f"{agent_name}.md"
 
-            output_file_path.parent.mkdir(parents=True, exist_ok=True)
-            output_file_path.write_text(final_prompt, encoding="utf-8")
+            try:
+                _write_text(output_file_path, final_prompt)
+            except FileNotFoundError:
+                # The output directory usually exists already; it is only created on demand
+                output_file_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_text(output_file_path, final_prompt)
 
-            ui.success(f"Successfully composed prompt for '{agent_name}' -> '{output_file_path.relative_to(Path.cwd())}'")
\ No newline at end of file
+            ui.success(f"Successfully composed prompt for '{agent_name}' -> '{self._display_path(output_file_path)}'")
\ No newline at end of file
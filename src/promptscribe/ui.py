@@ -20,23 +20,23 @@ Principles:
 
 import re
 import sys
-from typing import Dict, Any
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Tuple
 
 from rich.console import Console
 from rich.highlighter import RegexHighlighter
 from rich.panel import Panel
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeRemainingColumn,
-)
 from rich.style import Style
-from rich.syntax import Syntax
 from rich.table import Table
 from rich.text import Text
 
+# Syntax highlighting (which loads Pygments) and progress bars are rarely
+# needed, so they are only imported when first used.
+if TYPE_CHECKING:
+    from rich.progress import Progress
+    from rich.syntax import Syntax
+
 # --- Theme Definitions ---
 
 # Defines the visual properties for different types of CLI messages.
@@ -117,13 +117,32 @@ DEFAULT_SYNTAX_STYLE: Dict[str, Any] = {
     "word_wrap": True,
 }
 
-DEFAULT_PROGRESS_STYLE = (
-    SpinnerColumn(),
-    TextColumn("[progress.description]{task.description}"),
-    BarColumn(),
-    TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-    TimeRemainingColumn(),
-)
+
+def _default_progress_columns() -> Tuple[Any, ...]:
+    """Returns the default columns of progress bars."""
+    from rich.progress import BarColumn, SpinnerColumn, TextColumn, TimeRemainingColumn
+
+    return (
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TimeRemainingColumn(),
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Provides 'DEFAULT_PROGRESS_STYLE', the default progress bar columns, on
+    access, so that importing this module does not import rich.progress.
+    """
+    if name == "DEFAULT_PROGRESS_STYLE":
+        return _default_progress_columns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Text in single or double quotes; the 'variable' group is what gets highlighted
+_QUOTES_RE = re.compile(r"(?P<quotes>[\"'])(?P<variable>.*?)(?P=quotes)")
 
 
 class VariableHighlighter(RegexHighlighter):
@@ -131,9 +150,7 @@ class VariableHighlighter(RegexHighlighter):
     # Explicitly define the 'style' attribute with a type hint and a default value.
     style: Style = Style()
     
-    highlights = [
-        r"(?P<quotes>[\"'])(?P<variable>.*?)(?P=quotes)"
-    ]
+    highlights = [_QUOTES_RE.pattern]
 
     def highlight(self, text: Text) -> None:
         """
@@ -141,10 +158,8 @@ class VariableHighlighter(RegexHighlighter):
         We override the default method to apply the style only to the 'variable' group.
         """
         # The 'self.style' will be set on the instance by the UIManager before this is called.
-        for pattern in self.highlights:
-            for match in re.finditer(pattern, text.plain):
-                if "variable" in match.groupdict():
-                    text.stylize(self.style, *match.span("variable"))
+        for match in _QUOTES_RE.finditer(text.plain):
+            text.stylize(self.style, *match.span("variable"))
 
 
 class UIManager:
@@ -156,6 +171,16 @@ class UIManager:
         self._supports_unicode = self._check_unicode_support()
         # Select the appropriate theme configuration
         self._theme_config = THEME_CONFIG_UNICODE if self._supports_unicode else THEME_CONFIG_ASCII
+        # One highlighter per theme, set up with the theme's accent color
+        self._highlighters: Dict[str, VariableHighlighter] = {}
+        for name, theme in self._theme_config.items():
+            highlighter = VariableHighlighter()
+            highlighter.style = theme["accent"]
+            self._highlighters[name] = highlighter
+        # Per-thread message buffers used by 'deferred()'
+        self._local = threading.local()
+        # Keeps flushed message blocks from interleaving
+        self._output_lock = threading.Lock()
 
     def _check_unicode_support(self) -> bool:
         """
@@ -199,23 +224,33 @@ class UIManager:
                                    highlighted with the accent color.
         """
         if theme_name not in self._theme_config:
-            self._console.print(message, **kwargs)
+            self._emit(message, **kwargs)
             return
 
         theme = self._theme_config[theme_name]
         prefix = theme.get("prefix", "")
 
-        # Set up the highlighter with the theme's accent color
-        highlighter = VariableHighlighter()
-        highlighter.style = theme["accent"]
-
         # Apply the line style if requested
         style = theme["line"] if highlight_entire_line else Style()
 
-        full_message = Text(f"{prefix}{message}", style=style)
+        plain = f"{prefix}{message}"
+        full_message = Text(plain, style=style)
 
-        # Print using the console's highlight mechanism
-        self._console.print(highlighter(full_message), **kwargs)
+        # Only messages with quotes can contain variables to highlight
+        if '"' in plain or "'" in plain:
+            full_message = self._highlighters[theme_name](full_message)
+        self._emit(full_message, **kwargs)
+
+    def _emit(self, renderable: Any, **kwargs: Any) -> None:
+        """
+        Prints a renderable, or stores it in the current thread's buffer
+        while a 'deferred()' block is active.
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            self._console.print(renderable, **kwargs)
+        elif not self._console.quiet:
+            buffer.append((renderable, kwargs))
 
     # --- Public API for Simple Messages ---
 
@@ -247,6 +282,46 @@ class UIManager:
         syntax_block = self.create_syntax(code_string, language, **kwargs)
         self.render(syntax_block)
 
+    @contextmanager
+    def muted(self) -> Iterator[None]:
+        """
+        A context manager that temporarily silences all console output,
+        e.g. for dry runs whose messages would only be noise.
+        """
+        previous_state = self._console.quiet
+        self._console.quiet = True
+        try:
+            yield
+        finally:
+            self._console.quiet = previous_state
+
+    @contextmanager
+    def deferred(self) -> Iterator[List[Tuple[Any, Dict[str, Any]]]]:
+        """
+        A context manager that collects all messages printed by the current
+        thread instead of writing them to the console.
+
+        Used to keep the output of concurrently running tasks readable:
+        each task collects its messages, which are then printed as one
+        block with 'flush()'.
+
+        Yields:
+            The list the messages are collected into.
+        """
+        previous_buffer = getattr(self._local, "buffer", None)
+        buffer: List[Tuple[Any, Dict[str, Any]]] = []
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = previous_buffer
+
+    def flush(self, messages: List[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Prints messages collected by 'deferred()' as one uninterrupted block."""
+        with self._output_lock:
+            for renderable, kwargs in messages:
+                self._emit(renderable, **kwargs)
+
     # --- Public API for Complex Components (Factories) ---
 
     def create_table(self, *headers: str, **kwargs: Any) -> Table:
@@ -267,22 +342,26 @@ class UIManager:
         style_args.update(kwargs)
         return Panel(renderable, **style_args)
 
-    def create_syntax(self, code: str, lexer_name: str, **kwargs: Any) -> Syntax:
+    def create_syntax(self, code: str, lexer_name: str, **kwargs: Any) -> "Syntax":
         """
         Creates a rich.Syntax object with default application styling.
         Allows overriding defaults via kwargs.
         """
+        from rich.syntax import Syntax
+
         style_args = DEFAULT_SYNTAX_STYLE.copy()
         style_args.update(kwargs)
         return Syntax(code, lexer_name, **style_args)
     
-    def create_progress(self, **kwargs: Any) -> Progress:
+    def create_progress(self, **kwargs: Any) -> "Progress":
         """
         Creates a rich.Progress with default application styling.
         Allows overriding defaults via kwargs.
         """
+        from rich.progress import Progress
+
         # Start with the default columns
-        columns = list(DEFAULT_PROGRESS_STYLE)
+        columns = list(_default_progress_columns())
 
         # Create a Progress instance with the merged arguments
         return Progress(*columns, console=self._console, **kwargs)
@@ -294,7 +373,7 @@ class UIManager:
         Prints any rich-compatible renderable object to the console.
         This is the preferred way to output complex components.
         """
-        self._console.print(renderable, **kwargs)
+        self._emit(renderable, **kwargs)
 
 
 # --- Singleton Instance ---
@@ -309,6 +388,9 @@ warning = ui.warning
 info = ui.info
 title = ui.title
 code = ui.code
+muted = ui.muted
+deferred = ui.deferred
+flush = ui.flush
 create_table = ui.create_table
 create_panel = ui.create_panel
 create_syntax = ui.create_syntax
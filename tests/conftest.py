@@ -0,0 +1,27 @@
+"""Shared fixtures for the Prompt Scribe tests."""
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from .helpers import write_file
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Callable[..., Path]:
+    """
+    Returns a factory that lays out a '.prompt_scribe' directory in a temporary
+    working directory. It takes the content of 'prompts.yml' and further files
+    by path relative to '.prompt_scribe', and returns the config path.
+    """
+    monkeypatch.chdir(tmp_path)
+    base_dir = tmp_path / ".prompt_scribe"
+
+    def make(config: str, **files: str) -> Path:
+        write_file(base_dir / "prompts.yml", config)
+        for relative_path, content in files.items():
+            write_file(base_dir / relative_path, content)
+        return base_dir / "prompts.yml"
+
+    return make
@@ -0,0 +1,24 @@
+"""Helpers shared by the Prompt Scribe tests."""
+
+import os
+import textwrap
+from pathlib import Path
+
+
+def write_file(path: Path, content: str) -> None:
+    """
+    Writes a file and moves its modification time forward, so that a rewrite
+    is noticed even within the file system's timestamp resolution.
+    """
+    existed = path.exists()
+    previous_mtime = path.stat().st_mtime_ns if existed else 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(content), encoding="utf-8")
+    if existed:
+        mtime = max(path.stat().st_mtime_ns, previous_mtime + 1_000_000_000)
+        os.utime(path, ns=(mtime, mtime))
+
+
+def read_output(config_path: Path, agent_name: str) -> str:
+    """Returns the composed prompt of an agent written to the default output directory."""
+    return (config_path.parent / "composed_prompts" / f"{agent_name}.md").read_text(encoding="utf-8")
@@ -0,0 +1,132 @@
+"""
+Tests for the watch-mode 'ChangeHandler', which keeps reusing one composer
+for changes to dependency files and to the configuration.
+"""
+
+import queue
+
+import pytest
+import typer
+
+from promptscribe.cli import ChangeHandler
+from promptscribe.composer import PromptComposer
+
+from .helpers import read_output, write_file
+
+CONFIG = """
+variables:
+  project: Scribe
+agents:
+  main:
+    assembly:
+      - h1: "{{ project }}"
+      - include: includes/body.md
+  other:
+    assembly:
+      - content: "Other {{ project }}"
+"""
+
+
+def make_handler(project):
+    config_path = project(CONFIG, **{"includes/body.md": "Body v1\n"})
+    composer = PromptComposer(str(config_path))
+    composer.analyze_dependencies()
+    for agent_name in composer.get_all_agent_names():
+        composer.compose_agent(agent_name)
+    restart_queue = queue.Queue()
+    return config_path, ChangeHandler(composer, [], restart_queue), restart_queue
+
+
+def test_dependency_change_recomposes_affected_agents(project):
+    config_path, handler, _ = make_handler(project)
+    composer = handler.composer
+    body = (config_path.parent / "includes" / "body.md").resolve()
+
+    write_file(body, "Body v2\n")
+    handler.handle_dependency_change({str(body)})
+
+    assert handler.composer is composer
+    assert read_output(config_path, "main") == "# Scribe\n\nBody v2"
+
+
+def test_config_change_reloads_composer_in_place(project):
+    config_path, handler, restart_queue = make_handler(project)
+    composer = handler.composer
+
+    write_file(config_path, CONFIG.replace("content: \"Other", "content: \"Changed"))
+    rebuilt = handler.handle_config_change()
+
+    assert rebuilt == {"other"}
+    assert handler.composer is composer
+    assert restart_queue.empty()
+    assert read_output(config_path, "other") == "Changed Scribe"
+    assert read_output(config_path, "main") == "# Scribe\n\nBody v1"
+
+    # A file the reloaded configuration still includes keeps being tracked
+    body = (config_path.parent / "includes" / "body.md").resolve()
+    write_file(body, "Body v2\n")
+    handler.handle_dependency_change({str(body)})
+    assert read_output(config_path, "main") == "# Scribe\n\nBody v2"
+
+
+def test_unchanged_config_is_ignored(project):
+    config_path, handler, _ = make_handler(project)
+    assert handler.handle_config_change() == set()
+
+
+FAILING_CONFIG = """
+settings:
+  templates_dir: includes
+variables:
+  project: Scribe
+agents:
+  main:
+    assembly:
+      - h1: "{{ project }}"
+      - include: includes/body.md
+      - include: includes/extra.md
+  other:
+    template: missing.j2
+"""
+
+
+def test_failed_config_recompose_still_refreshes_handler(project):
+    config_path, handler, restart_queue = make_handler(project)
+    base_dir = config_path.parent
+    write_file(base_dir / "includes" / "extra.md", "Extra v1\n")
+
+    write_file(config_path, FAILING_CONFIG)
+    with pytest.raises(typer.Exit):
+        handler.handle_config_change()
+
+    assert restart_queue.empty()
+    assert handler.retry_agents == {"other"}
+    assert read_output(config_path, "main") == "# Scribe\n\nBody v1\n\nExtra v1"
+
+    # The file included by the new configuration is tracked despite the failure
+    extra = (base_dir / "includes" / "extra.md").resolve()
+    write_file(extra, "Extra v2\n")
+    handler.handle_dependency_change({str(extra)})
+    assert read_output(config_path, "main") == "# Scribe\n\nBody v1\n\nExtra v2"
+
+    # The failed agent is retried with the next config change, even if that
+    # change does not touch it
+    write_file(base_dir / "includes" / "missing.j2", "Template for {{ project }}")
+    write_file(config_path, FAILING_CONFIG.replace('h1: "{{ project }}"', 'h2: "{{ project }}"'))
+    assert handler.handle_config_change() == {"main", "other"}
+    assert handler.retry_agents == set()
+    assert read_output(config_path, "other") == "Template for Scribe"
+
+
+def test_failed_config_recompose_still_signals_restart(project):
+    config_path, handler, restart_queue = make_handler(project)
+    write_file(config_path.parent / "more" / "extra.md", "Extra\n")
+
+    write_file(config_path, FAILING_CONFIG.replace("includes/extra.md", "more/extra.md"))
+    with pytest.raises(typer.Exit):
+        handler.handle_config_change()
+
+    composer, retry_agents = restart_queue.get_nowait()
+    assert composer is handler.composer
+    assert retry_agents == {"other"}
+    assert ChangeHandler(composer, [], restart_queue, retry_agents).retry_agents == {"other"}
@@ -0,0 +1,44 @@
+"""Tests for the bounded cache of compiled substitution templates."""
+
+import sys
+import threading
+
+from promptscribe import composer as composer_module
+from promptscribe.composer import PromptComposer
+
+CONFIG = """
+agents:
+  main:
+    assembly:
+      - content: "x"
+"""
+
+
+def test_eviction_is_safe_across_threads(project, monkeypatch):
+    monkeypatch.setattr(composer_module, "MAX_COMPILED_TEMPLATES", 4)
+    composer = PromptComposer(str(project(CONFIG)))
+    errors = []
+    start = threading.Barrier(8)
+
+    def compile_many(worker):
+        start.wait()
+        try:
+            for i in range(300):
+                composer._compile(f"{{{{ value|default('{worker}-{i}') }}}}")
+        except Exception as e:
+            errors.append(e)
+
+    # Frequent thread switches make the race between eviction and inserts likely
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=compile_many, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    assert errors == []
+    assert len(composer._compile_cache) <= 4
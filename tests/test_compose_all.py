@@ -0,0 +1,95 @@
+"""
+Tests for 'PromptComposer.compose_all', which composes agents in worker
+processes and ships their messages and errors back to the parent.
+"""
+
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from promptscribe import composer as composer_module
+from promptscribe.composer import PromptComposer, PromptScribeError
+from promptscribe.ui import ui
+
+CONFIG = """
+variables:
+  project: Scribe
+agents:
+  assembled:
+    assembly:
+      - h1: "{{ project }}"
+      - include:
+          path: includes/doc.md
+          fit_headings: 2
+      - content: "Missing {{ nowhere }}"
+  templated:
+    template: main.j2
+    output_file: "{{ project }}.txt"
+  no_template:
+    variables:
+      unused: true
+"""
+
+FILES = {
+    "includes/doc.md": "# Doc for {{ project }}\n\ntext\n",
+    "templates/main.j2": "Template {{ project|upper }} {{ read_file('includes/doc.md') }}",
+}
+
+
+def outputs(config_path):
+    """Returns the composed files by path relative to '.prompt_scribe'."""
+    base_dir = config_path.parent
+    return {
+        path.relative_to(base_dir).as_posix(): path.read_text(encoding="utf-8")
+        for path in (base_dir / "composed_prompts").glob("*")
+    }
+
+
+def plain(messages):
+    return [str(renderable) for renderable, _ in messages]
+
+
+def compose_sequentially(composer, agent_names):
+    results = []
+    for agent_name in agent_names:
+        with ui.deferred() as messages:
+            try:
+                composer.compose_agent(agent_name)
+            except Exception as e:
+                results.append((agent_name, plain(messages), e))
+                continue
+        results.append((agent_name, plain(messages), None))
+    return results
+
+
+@pytest.mark.parametrize("start_method", multiprocessing.get_all_start_methods())
+def test_compose_all_matches_sequential_composition(project, monkeypatch, start_method):
+    config_path = project(CONFIG, **FILES)
+    composer = PromptComposer(str(config_path))
+    agent_names = composer.get_all_agent_names()
+
+    expected = compose_sequentially(composer, agent_names)
+    expected_outputs = outputs(config_path)
+    for path in expected_outputs:
+        (config_path.parent / path).unlink()
+
+    monkeypatch.setattr(
+        composer_module,
+        "ProcessPoolExecutor",
+        functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context(start_method)),
+    )
+    results = [
+        (agent_name, plain(messages), error)
+        for agent_name, messages, error in composer.compose_all(agent_names)
+    ]
+
+    assert [name for name, _, _ in results] == agent_names
+    for (name, messages, error), (_, expected_messages, expected_error) in zip(results, expected):
+        assert messages == expected_messages, name
+        assert type(error) is type(expected_error), name
+        assert str(error) == str(expected_error), name
+    assert any(isinstance(error, PromptScribeError) for _, _, error in results)
+    assert outputs(config_path) == expected_outputs
+    assert set(expected_outputs) == {"composed_prompts/assembled.md", "composed_prompts/Scribe.txt"}
@@ -0,0 +1,39 @@
+"""Tests for loading configurations and comparing them in watch mode."""
+
+from promptscribe.composer import PromptComposer, _fingerprint
+
+from .helpers import read_output, write_file
+
+MIXED_KEYS_CONFIG = """
+variables:
+  1: one
+  name: x
+agents:
+  main:
+    assembly:
+      - content: "Hello {{ name }}"
+"""
+
+
+def test_config_with_mixed_key_types_composes(project):
+    config_path = project(MIXED_KEYS_CONFIG)
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "Hello x"
+
+
+def test_config_with_mixed_key_types_is_fingerprinted(project):
+    config_path = project(MIXED_KEYS_CONFIG)
+    composer = PromptComposer(str(config_path))
+    old_fingerprints = composer.config_fingerprints
+
+    write_file(config_path, MIXED_KEYS_CONFIG.replace("1: one", "1: uno"))
+    assert composer.reload_if_changed()
+
+    assert composer.config_fingerprints["variables"] != old_fingerprints["variables"]
+    assert composer.config_fingerprints["agents"] == old_fingerprints["agents"]
+
+
+def test_fingerprint_keeps_key_types_apart():
+    assert _fingerprint({1: "a", "b": 2}) == _fingerprint({"b": 2, 1: "a"})
+    assert _fingerprint({1: "a", None: "b"}) != _fingerprint({"1": "a", None: "b"})
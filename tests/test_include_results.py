@@ -0,0 +1,126 @@
+"""
+Tests for the per-composition table of substituted included files: a file
+included several times by one agent is rendered once, and only while its
+content and the variables are the very objects it was rendered from.
+"""
+
+from promptscribe import composer as composer_module
+from promptscribe.composer import PromptComposer
+
+from .helpers import read_output, write_file
+
+CONFIG = """
+variables:
+  who: world
+agents:
+  twice:
+    assembly:
+      - include: includes/shared.md
+      - include: includes/shared.md
+  other:
+    assembly:
+      - include: includes/shared.md
+"""
+
+
+def count_renders(monkeypatch, composer, file_path):
+    """Counts the templates compiled or looked up for an included file."""
+    calls = []
+    original = composer._compile
+
+    def counting_compile(text, path=None):
+        if path == file_path:
+            calls.append(text)
+        return original(text, path)
+
+    monkeypatch.setattr(composer, "_compile", counting_compile)
+    return calls
+
+
+def collect_warnings(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(composer_module.ui, "warning", lambda message, **kwargs: warnings.append(message))
+    return warnings
+
+
+def test_repeated_include_is_rendered_once(project, monkeypatch):
+    config_path = project(CONFIG, **{"includes/shared.md": "Hello {{ who|upper }}\n"})
+    composer = PromptComposer(str(config_path))
+    renders = count_renders(monkeypatch, composer, "includes/shared.md")
+
+    composer.compose_agent("twice")
+
+    assert read_output(config_path, "twice") == "Hello WORLD\n\nHello WORLD"
+    assert len(renders) == 1
+
+
+def test_each_composition_renders_again(project, monkeypatch):
+    config_path = project(CONFIG, **{"includes/shared.md": "Hello {{ who|upper }}\n"})
+    composer = PromptComposer(str(config_path))
+    renders = count_renders(monkeypatch, composer, "includes/shared.md")
+
+    composer.compose_agent("twice")
+    composer.compose_agent("twice")
+    composer.compose_agent("other")
+
+    assert len(renders) == 3
+
+
+def test_reloaded_file_is_rendered_again(project):
+    config_path = project(CONFIG, **{"includes/shared.md": "Hello {{ who|upper }}\n"})
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("twice")
+
+    shared = config_path.parent / "includes" / "shared.md"
+    write_file(shared, "Bye {{ who|upper }}\n")
+    composer.invalidate([shared])
+    composer.compose_agent("twice")
+
+    assert read_output(config_path, "twice") == "Bye WORLD\n\nBye WORLD"
+
+
+def test_changed_content_within_a_composition_is_not_reused(project):
+    config_path = project(CONFIG, **{"includes/shared.md": "unused\n"})
+    composer = PromptComposer(str(config_path))
+    variables = {"who": "world"}
+    composer._subst_context.results = {}
+
+    first = composer._substitute_variables("A {{ who|upper }}", variables, file_path_context="x.md")
+    second = composer._substitute_variables("B {{ who|upper }}", variables, file_path_context="x.md")
+    other_variables = composer._substitute_variables("B {{ who|upper }}", {"who": "bee"}, file_path_context="x.md")
+
+    assert (first, second, other_variables) == ("A WORLD", "B WORLD", "B BEE")
+
+
+def test_fit_headings_include_is_rendered_separately(project):
+    config_path = project(
+        """
+        variables:
+          who: world
+        agents:
+          fitted:
+            assembly:
+              - include: includes/doc.md
+              - include:
+                  path: includes/doc.md
+                  fit_headings: 3
+        """,
+        **{"includes/doc.md": "# Title {{ who|upper }}\n\ntext\n"},
+    )
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("fitted")
+
+    assert read_output(config_path, "fitted") == "# Title WORLD\n\ntext\n\n### Title WORLD\n\ntext"
+
+
+def test_repeated_include_warns_at_first_site_only(project, monkeypatch):
+    config_path = project(CONFIG, **{"includes/shared.md": "Hello {{ missing }}\n"})
+    composer = PromptComposer(str(config_path))
+    warnings = collect_warnings(monkeypatch)
+
+    composer.compose_agent("twice")
+    assert sum("'missing'" in message for message in warnings) == 1
+    assert read_output(config_path, "twice") == "Hello {{ missing }}\n\nHello {{ missing }}"
+
+    composer.compose_agent("other")
+    assert sum("'missing'" in message for message in warnings) == 2
@@ -0,0 +1,92 @@
+"""
+Tests for '_render_simple', the shortcut for strings whose only template syntax
+is bare placeholders: it must produce exactly what Jinja renders, and defer to
+Jinja (by returning None) for everything else.
+"""
+
+import itertools
+
+import jinja2
+import pytest
+
+from promptscribe.composer import _render_simple
+
+VARIABLES = {
+    "a": "alpha",
+    "b": 3,
+    "c": None,
+    "d": [1, "two"],
+    "crlf": "x\r\ny",
+    "nl": "ends with newline\n",
+    "braces": "{{ a }}",
+    "true": "shadowed",
+    "self": "shadowed",
+}
+
+
+def render_with_jinja(text: str) -> str:
+    return jinja2.Environment(autoescape=False).from_string(text).render(VARIABLES)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "{{ a }}",
+        "{{a}}",
+        "{{  b\n}}",
+        "{{ c }} and {{ d }}",
+        "before {{ a }} after",
+        "line\r\n{{ a }}\r\nend",
+        "old mac\r{{ a }}\r",
+        "{{ a }}\n",
+        "{{ a }}\n\n",
+        "{{ crlf }}",
+        "{{ nl }}",
+        "{{ braces }}",
+        "{{ a }}}",
+        "} {{ a }} }}",
+        "{ {{ b }}",
+    ],
+)
+def test_matches_jinja(text):
+    assert _render_simple(text, VARIABLES) == render_with_jinja(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "{{{ a }}}",
+        "{{{ a }}",
+        "{{ a -}}",
+        "{{- a }}",
+        "{{ a|upper }}",
+        "{{ a.b }}",
+        "{{ true }}",
+        "{{ none }}",
+        "{{ True }}",
+        "{{ self }}",
+        "{{ range }}",
+        "{{ read_file }}",
+        "{{ undefined }}",
+        "{{ a }} {{ undefined }}",
+        "{% if a %}x{% endif %}",
+        "{{ a }} {# comment #}",
+        "{{ a }} {%",
+    ],
+)
+def test_defers_to_jinja(text):
+    assert _render_simple(text, VARIABLES) is None
+
+
+def test_combinations_match_jinja():
+    atoms = ["{{ a }}", "{{b}}", "{{ nl }}", "{{ crlf }}", "{", "}", "x", " ", "\n", "\r\n", "\r"]
+    checked = 0
+    for length in range(1, 4):
+        for combination in itertools.product(atoms, repeat=length):
+            text = "".join(combination)
+            rendered = _render_simple(text, VARIABLES)
+            if rendered is None:
+                continue
+            checked += 1
+            assert rendered == render_with_jinja(text), repr(text)
+    assert checked
@@ -0,0 +1,27 @@
+"""Tests for the lazily imported parts of 'promptscribe.ui'."""
+
+import os
+import subprocess
+import sys
+
+from rich.progress import ProgressColumn
+
+from promptscribe import ui as ui_module
+
+
+def test_default_progress_style_is_still_available():
+    from promptscribe.ui import DEFAULT_PROGRESS_STYLE
+
+    assert len(DEFAULT_PROGRESS_STYLE) == 5
+    assert all(isinstance(column, ProgressColumn) for column in DEFAULT_PROGRESS_STYLE)
+    assert len(ui_module.create_progress().columns) == 5
+
+
+def test_import_does_not_load_syntax_or_progress():
+    code = (
+        "import sys, promptscribe.ui; "
+        "print(sorted({'rich.progress', 'rich.syntax', 'pygments'} & set(sys.modules)))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,183 @@
+"""
+Tests for a composer that stays alive across changes, as in watch mode:
+after 'invalidate()' or 'reload_if_changed()' it must compose what a fresh
+composer would.
+"""
+
+import os
+
+import pytest
+
+from promptscribe import composer as composer_module
+from promptscribe.composer import PromptComposer
+
+from .helpers import read_output, write_file
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+def test_reload_follows_repointed_symlink(project):
+    config_path = project(
+        """
+        agents:
+          main:
+            assembly:
+              - include: includes/current.md
+        """,
+        **{"includes/v1.md": "V1\n", "includes/v2.md": "V2\n"},
+    )
+    includes = config_path.parent / "includes"
+    os.symlink("v1.md", includes / "current.md")
+
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "V1"
+
+    os.remove(includes / "current.md")
+    os.symlink("v2.md", includes / "current.md")
+    write_file(config_path, config_path.read_text(encoding="utf-8") + "\n")
+    assert composer.reload_if_changed()
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "V2"
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+def test_invalidate_follows_repointed_symlink(project):
+    config_path = project(
+        """
+        agents:
+          main:
+            assembly:
+              - include: includes/current.md
+        """,
+        **{"includes/v1.md": "V1\n", "includes/v2.md": "V2\n"},
+    )
+    includes = config_path.parent / "includes"
+    os.symlink("v1.md", includes / "current.md")
+
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+
+    os.remove(includes / "current.md")
+    os.symlink("v2.md", includes / "current.md")
+    composer.invalidate([includes / "current.md"])
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "V2"
+
+
+CONFIG = """
+variables:
+  project: Scribe
+  rules: "{{ read_file('includes/rules.md') }}"
+agents:
+  main:
+    assembly:
+      - h1: "{{ project }}"
+      - content: "{{ rules }}"
+      - include: includes/body.md
+"""
+
+
+def make_watched_project(project):
+    return project(
+        CONFIG,
+        **{"includes/rules.md": "Rules v1\n", "includes/body.md": "Body v1 for {{ project }}\n"},
+    )
+
+
+def compose_fresh(config_path, agent_name):
+    PromptComposer(str(config_path)).compose_agent(agent_name)
+    return read_output(config_path, agent_name)
+
+
+def test_invalidate_rereads_file_used_by_variables(project):
+    config_path = make_watched_project(project)
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "# Scribe\n\nRules v1\n\nBody v1 for Scribe"
+
+    rules = config_path.parent / "includes" / "rules.md"
+    write_file(rules, "Rules v2\n")
+    composer.invalidate([rules])
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "# Scribe\n\nRules v2\n\nBody v1 for Scribe"
+
+
+def test_invalidate_rereads_included_file(project):
+    config_path = make_watched_project(project)
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+
+    body = config_path.parent / "includes" / "body.md"
+    write_file(body, "Body v2 for {{ project }}\n")
+    composer.invalidate([body])
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "# Scribe\n\nRules v1\n\nBody v2 for Scribe"
+
+
+def test_reload_applies_edited_config(project):
+    config_path = make_watched_project(project)
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+    assert not composer.reload_if_changed()
+
+    write_file(config_path, CONFIG.replace("project: Scribe", "project: Renamed"))
+    assert composer.reload_if_changed()
+    composer.compose_agent("main")
+    assert read_output(config_path, "main") == "# Renamed\n\nRules v1\n\nBody v1 for Renamed"
+    assert composer.dependencies["main"] == {
+        config_path.resolve(),
+        (config_path.parent / "includes" / "rules.md").resolve(),
+        (config_path.parent / "includes" / "body.md").resolve(),
+    }
+
+
+def test_long_lived_composer_matches_fresh_composer(project):
+    config_path = make_watched_project(project)
+    includes = config_path.parent / "includes"
+    composer = PromptComposer(str(config_path))
+    composer.compose_agent("main")
+
+    write_file(includes / "rules.md", "Rules v2\n")
+    composer.invalidate([includes / "rules.md"])
+    composer.compose_agent("main")
+
+    write_file(config_path, CONFIG.replace("includes/body.md", "includes/other.md"))
+    write_file(includes / "other.md", "Other for {{ project }}\n")
+    assert composer.reload_if_changed()
+    composer.compose_agent("main")
+
+    write_file(includes / "rules.md", "Rules v3\n")
+    write_file(includes / "other.md", "Other v2 for {{ project }}\n")
+    composer.invalidate([includes / "rules.md", includes / "other.md"])
+    composer.compose_agent("main")
+
+    reused = read_output(config_path, "main")
+    assert reused == "# Scribe\n\nRules v3\n\nOther v2 for Scribe"
+    assert reused == compose_fresh(config_path, "main")
+
+
+def test_cached_variables_report_their_warnings_again(project, monkeypatch):
+    config_path = project(
+        """
+        variables:
+          greeting: "Hello {{ missing }}"
+          rules: "{{ read_file('includes/absent.md') }}"
+        agents:
+          main:
+            assembly:
+              - content: "{{ greeting }}"
+        """
+    )
+    warnings = []
+    monkeypatch.setattr(composer_module.ui, "warning", lambda message, **kwargs: warnings.append(message))
+    composer = PromptComposer(str(config_path))
+
+    composer.compose_agent("main")
+    first = list(warnings)
+    assert any("'missing'" in message for message in first)
+    assert any("absent.md" in message for message in first)
+
+    warnings.clear()
+    composer.compose_agent("main")
+    assert warnings == first
+    assert read_output(config_path, "main") == "Hello {{ missing }}"